@@ -5,8 +5,12 @@ This module provides comprehensive help content for users to understand
 how to use the accessibility dashboard effectively.
 """
 
+from functools import lru_cache
+
 from shiny import ui
 
+# The help content is static, so each tree is built once and shared by all sessions
+@lru_cache(maxsize=None)
 def get_help_content():
     """
     Returns the complete help content as a UI element
@@ -88,6 +92,7 @@ Sarah,35,Marketing,68000""",
         style="max-height: 80vh; overflow-y: auto; background-color: var(--bs-light); border-radius: 8px;"
     )
 
+@lru_cache(maxsize=None)
 def get_help_modal():
     """
     Returns a modal dialog containing the help content
@@ -1,34 +1,51 @@
+import os
+import matplotlib
+
+# Non-interactive backend: the app only ever renders to SVG/HTML. Set through
+# MPLBACKEND as well, which is what tells maidr to keep it on import
+os.environ.setdefault("MPLBACKEND", "Agg")
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+# No interactive redraws after each pyplot call
+plt.ioff()
 import numpy as np
 import pandas as pd
-import seaborn as sns
-import uuid
-import os
 import tempfile
 from pathlib import Path
-from matplotlib.backends.backend_svg import FigureCanvasSVG
 from maidr.widget.shiny import render_maidr
 import maidr
+from maidr.util.figure_lock import figure_lock
 from shiny import App, reactive, render, ui
 from shiny.types import FileInfo
+import builtins
+import codecs
 import datetime
+import hashlib
+import html
+import io
 import re
-
-# Import plot modules
-from plots.utils import color_palettes
-from plots.histogram import create_histogram, create_custom_histogram
-from plots.boxplot import create_boxplot, create_custom_boxplot
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import redirect_stdout, redirect_stderr
+from functools import lru_cache
+from typing import NamedTuple
+
+# pyarrow is optional: when present it gives a much faster CSV parser
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Import plot modules; the builders in the plots package are loaded on first use
+import plots
+from plots.utils import FigureCache, color_palettes, run_plot_task
 
 # Function to save HTML with UTF-8 encoding to avoid Windows encoding issues
 def save_html_utf8(fig, filepath):
     """Save matplotlib figure as HTML with proper UTF-8 encoding"""
-    import io
-    import sys
-    import codecs
-    import os
-    import builtins
-    from contextlib import redirect_stdout, redirect_stderr
-    
     # Store original open function
     original_open = builtins.open
     
@@ -138,20 +155,222 @@ def save_html_utf8(fig, filepath):
         sys.stdout = old_stdout
         sys.stderr = old_stderr
 
-from plots.scatterplot import create_scatterplot, create_custom_scatterplot
-from plots.barplot import create_barplot, create_custom_barplot
-from plots.lineplot import create_lineplot, create_custom_lineplot
-from plots.heatmap import create_heatmap, create_custom_heatmap
-from plots.multilineplot import generate_multiline_data, create_multiline_plot, create_custom_multiline_plot
-from plots.multilayerplot import create_multilayer_plot, create_custom_multilayer_plot
-from plots.multipanelplot import create_multipanel_plot, create_custom_multipanel_plot
-from plots.candlestick import create_candlestick
-
 # Import help menu module
 from HelpMenu import get_help_modal, QUICK_HELP_TIPS
 
-# Set random seed
-np.random.seed(1000)
+# Select choices, built once and shared by every session
+_THEME_CHOICES = ("Light", "Dark")
+_COLOR_KEYS = tuple(color_palettes)
+_DIST_CHOICES = (
+    "Normal Distribution",
+    "Positively Skewed",
+    "Negatively Skewed",
+    "Unimodal Distribution",
+    "Bimodal Distribution",
+    "Multimodal Distribution",
+)
+_BOXPLOT_CHOICES = (
+    "Positively Skewed with Outliers",
+    "Negatively Skewed with Outliers",
+    "Symmetric with Outliers",
+    "Symmetric without Outliers",
+)
+_SCATTER_CHOICES = (
+    "No Correlation",
+    "Weak Positive Correlation",
+    "Strong Positive Correlation",
+    "Weak Negative Correlation",
+    "Strong Negative Correlation",
+)
+_LINEPLOT_CHOICES = ("Linear Trend", "Exponential Growth", "Sinusoidal Pattern", "Random Walk")
+_HEATMAP_CHOICES = ("Random", "Correlated", "Checkerboard")
+_MULTILINE_CHOICES = ("Simple Trends", "Seasonal Patterns", "Growth Comparison", "Random Series")
+_MULTILINE_PALETTES = ("Default", "Colorful", "Pastel", "Dark Tones", "Paired Colors", "Rainbow")
+_MULTILAYER_BACKGROUND_CHOICES = ("Bar Plot", "Histogram", "Scatter Plot")
+_CANDLESTICK_COMPANIES = ("Tesla", "Apple", "NVIDIA", "Microsoft", "Google", "Amazon")
+_CANDLESTICK_TIMEFRAMES = ("Daily", "Monthly", "Yearly")
+_PRACTICE_PLOT_CHOICES = (
+    "",
+    "Histogram",
+    "Box Plot",
+    "Scatter Plot",
+    "Bar Plot",
+    "Line Plot",
+    "Heatmap",
+)
+
+# The Practice plot type dropdown never changes, so its tag is built once
+_PLOT_TYPE_SELECT = ui.input_select(
+    "plot_type",
+    "Select plot type:",
+    choices=_PRACTICE_PLOT_CHOICES
+)
+
+# Variable inputs and color input read by each Practice plot type
+_CUSTOM_PLOT_INPUTS = {
+    "Histogram": (("hist_var_x",), "hist_custom_color"),
+    "Box Plot": (("boxplot_var_x", "boxplot_var_y"), "boxplot_custom_color"),
+    "Scatter Plot": (("scatter_var_x", "scatter_var_y"), "scatter_custom_color"),
+    "Bar Plot": (("barplot_var_x",), "barplot_custom_color"),
+    "Line Plot": (("lineplot_var_x", "lineplot_var_y"), "lineplot_custom_color"),
+    "Heatmap": (("heatmap_var_x", "heatmap_var_y", "heatmap_var_value"), None),
+}
+
+# Seconds the Practice selections must stay unchanged before the plot is rebuilt
+_CUSTOM_PLOT_DEBOUNCE_SECS = 0.25
+
+# Seconds tutorial settings must stay unchanged before they are announced
+_ANNOUNCE_DEBOUNCE_SECS = 0.3
+
+# Marks a debounced value that has not settled (or failed), never equal to a real one
+_UNSETTLED = object()
+
+# Tutorial tab figures only depend on their select inputs, so each combination
+# is drawn once, on first request, and then shared by every session
+tutorial_figures = FigureCache()
+
+async def draw_tutorial(key, builder, *args):
+    """Return the cached tutorial axes for key, drawing them on the drawing thread on a miss"""
+    ax = tutorial_figures.get(key)
+    if ax is None:
+        ax = await run_plot_task(tutorial_figures.draw, key, builder, *args)
+    return ax
+
+# Practice plots kept per session, so a repeated selection reuses its figure
+_CUSTOM_PLOT_CACHE_SIZE = 4
+
+def debounce(delay_secs):
+    """Turn a reactive function into a calc that only updates once its value has
+    stopped changing for delay_secs, and only if the settled value differs from
+    the previous one (Shiny for Python has no reactive.debounce)"""
+    def wrapper(fn):
+        deadline = reactive.Value(None)
+        trigger = reactive.Value(0)
+        last = [_UNSETTLED]
+
+        @reactive.calc
+        def current():
+            return fn()
+
+        # Restart the countdown whenever the wrapped value is invalidated
+        @reactive.effect(priority=102)
+        def restart():
+            try:
+                current()
+            except Exception:
+                pass
+            deadline.set(time.monotonic() + delay_secs)
+
+        @reactive.effect(priority=101)
+        def countdown():
+            when = deadline.get()
+            if when is None:
+                return
+            remaining = when - time.monotonic()
+            if remaining > 0:
+                reactive.invalidate_later(remaining)
+                return
+            with reactive.isolate():
+                deadline.set(None)
+                try:
+                    value = current()
+                except Exception:
+                    # Let the settled calc re-raise (e.g. a silent missing input)
+                    value = _UNSETTLED
+                if value is not _UNSETTLED and value == last[0]:
+                    return
+                last[0] = value
+                trigger.set(trigger.get() + 1)
+
+        @reactive.calc
+        @reactive.event(trigger)
+        def settled():
+            # Also runs once on first read, before any countdown; remember that
+            # value so the countdown does not deliver it a second time
+            value = current()
+            last[0] = value
+            return value
+
+        return settled
+    return wrapper
+
+# SVG text of each figure downloaded so far. Figures are not changed once drawn,
+# so repeated downloads of a plot (from any session) reuse one serialization
+_svg_cache = weakref.WeakKeyDictionary()
+
+def figure_svg(fig):
+    """Return the figure as SVG text, serialized once per figure"""
+    svg = _svg_cache.get(fig)
+    if svg is None:
+        buffer = io.StringIO()
+        # savefig swaps the figure's dpi and canvas while it writes, and tutorial
+        # figures are shared, so hold the lock maidr takes for its own renders
+        with figure_lock(fig):
+            # Use the figure's own background rather than the savefig colors of
+            # whichever theme style was applied last, so the result is stable
+            fig.savefig(buffer, format='svg', bbox_inches='tight', facecolor='auto', edgecolor='auto')
+        svg = buffer.getvalue()
+        _svg_cache[fig] = svg
+    return svg
+
+# Parsed uploads keyed by content hash, so re-uploading a file skips parsing
+_CSV_CACHE_SIZE = 4
+_csv_cache = OrderedDict()
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Dtype kind codes treated as numeric: ints, unsigned, floats, complex, timedelta
+_NUMERIC_KINDS = list("iufcm")
+
+@lru_cache(maxsize=16)
+def with_placeholder(columns, placeholder=""):
+    """Select choices for a tuple of columns, led by a placeholder entry"""
+    return (placeholder,) + columns
+
+class UploadedData(NamedTuple):
+    """A parsed upload together with its column classification"""
+    df: pd.DataFrame
+    numeric_vars: tuple
+    categorical_vars: tuple
+    summary: pd.DataFrame
+
+def load_csv(path):
+    """Parse an uploaded CSV and classify its columns, memoized on the file content
+
+    Returns an UploadedData bundle, so the columns are only classified once per file.
+    """
+    # Hash in fixed-size chunks so the raw bytes are never held alongside the frame
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    key = digest.hexdigest()
+    if key in _csv_cache:
+        _csv_cache.move_to_end(key)
+        return _csv_cache[key]
+
+    # Parse with Arrow's multithreaded reader when available, but keep
+    # NumPy-backed columns since the plot functions expect them
+    df = pd.read_csv(path, engine="pyarrow" if PYARROW_AVAILABLE else "c")
+    # Split the columns on the dtype kind in one pass; these kinds are exactly what
+    # select_dtypes(include='number') keeps, without building two sub-frames
+    kinds = np.array([dtype.kind for dtype in df.dtypes], dtype="U1")
+    is_numeric = np.isin(kinds, _NUMERIC_KINDS)
+    numeric_cols = tuple(df.columns[is_numeric])
+    categorical_cols = tuple(df.columns[~is_numeric])
+    # Built from plain arrays, so the frame needs no index alignment
+    summary = pd.DataFrame({
+        'Column': df.columns.to_numpy(),
+        # Show the same classification the variable selectors use, whatever the
+        # underlying width or backend (int32, float32, nullable, Arrow strings...)
+        'Type': np.where(is_numeric, "numeric", "categorical"),
+        'Non-null': df.count().to_numpy()
+    })
+
+    result = UploadedData(df, numeric_cols, categorical_cols, summary)
+    _csv_cache[key] = result
+    if len(_csv_cache) > _CSV_CACHE_SIZE:
+        _csv_cache.popitem(last=False)
+    return result
 
 # Define the UI components for the Shiny application with tabs and sidebar
 app_ui = ui.page_fluid(
@@ -733,7 +952,7 @@ app_ui = ui.page_fluid(
                 ui.input_select(
                     "theme", 
                     "Theme:", 
-                    choices=["Light", "Dark"], 
+                    choices=_THEME_CHOICES, 
                     selected="Light"
                 )
             ),
@@ -760,7 +979,42 @@ app_ui = ui.page_fluid(
                         ui.input_file("file_upload", "Upload CSV File", accept=".csv"),
                         ui.output_table("data_types"),
                         ui.output_ui("plot_options"),
-                        ui.output_ui("variable_input"),
+                        # Variable selectors are built once and shown for the chosen plot type;
+                        # their choices are filled in with update_select on each upload
+                        ui.panel_conditional(
+                            "input.plot_type === 'Histogram'",
+                            ui.input_select("hist_var_x", "Select numeric variable:", choices=[""]),
+                            ui.input_select("hist_custom_color", "Select color:", choices=_COLOR_KEYS, selected="Default"),
+                        ),
+                        ui.panel_conditional(
+                            "input.plot_type === 'Box Plot'",
+                            ui.input_select("boxplot_var_x", "Select numeric variable:", choices=[""]),
+                            ui.input_select("boxplot_var_y", "Select grouping variable (optional):", choices=["None"], selected="None"),
+                            ui.input_select("boxplot_custom_color", "Select color:", choices=_COLOR_KEYS, selected="Default"),
+                        ),
+                        ui.panel_conditional(
+                            "input.plot_type === 'Scatter Plot'",
+                            ui.input_select("scatter_var_x", "Select X variable:", choices=[""]),
+                            ui.input_select("scatter_var_y", "Select Y variable:", choices=[""]),
+                            ui.input_select("scatter_custom_color", "Select color:", choices=_COLOR_KEYS, selected="Default"),
+                        ),
+                        ui.panel_conditional(
+                            "input.plot_type === 'Bar Plot'",
+                            ui.input_select("barplot_var_x", "Select categorical variable:", choices=[""]),
+                            ui.input_select("barplot_custom_color", "Select color:", choices=_COLOR_KEYS, selected="Default"),
+                        ),
+                        ui.panel_conditional(
+                            "input.plot_type === 'Line Plot'",
+                            ui.input_select("lineplot_var_x", "Select X variable:", choices=[""]),
+                            ui.input_select("lineplot_var_y", "Select Y variable:", choices=[""]),
+                            ui.input_select("lineplot_custom_color", "Select color:", choices=_COLOR_KEYS, selected="Default"),
+                        ),
+                        ui.panel_conditional(
+                            "input.plot_type === 'Heatmap'",
+                            ui.input_select("heatmap_var_x", "Select X (categorical):", choices=[""]),
+                            ui.input_select("heatmap_var_y", "Select Y (categorical):", choices=[""]),
+                            ui.input_select("heatmap_var_value", "Select numeric value (optional):", choices=["None"], selected="None"),
+                        ),
                     ),
                     ui.column(10, 
                         ui.div(
@@ -797,20 +1051,13 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "distribution_type",
                 "Select histogram distribution type:",
-                choices=[
-                    "Normal Distribution",
-                    "Positively Skewed",
-                    "Negatively Skewed",
-                    "Unimodal Distribution",
-                    "Bimodal Distribution",
-                    "Multimodal Distribution",
-                ],
+                choices=_DIST_CHOICES,
                 selected="Normal Distribution",
             ),
             ui.input_select(
                 "hist_color",
                 "Select histogram color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.tags.main(
@@ -844,18 +1091,13 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "boxplot_type",
                 "Select box plot type:",
-                choices=[
-                    "Positively Skewed with Outliers",
-                    "Negatively Skewed with Outliers",
-                    "Symmetric with Outliers",
-                    "Symmetric without Outliers",
-                ],
+                choices=_BOXPLOT_CHOICES,
                 selected="Positively Skewed with Outliers",
             ),
             ui.input_select(
                 "boxplot_color",
                 "Select box plot color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.tags.main(
@@ -889,19 +1131,13 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "scatterplot_type",
                 "Select scatter plot type:",
-                choices=[
-                    "No Correlation",
-                    "Weak Positive Correlation",
-                    "Strong Positive Correlation",
-                    "Weak Negative Correlation",
-                    "Strong Negative Correlation",
-                ],
+                choices=_SCATTER_CHOICES,
                 selected="No Correlation",
             ),
             ui.input_select(
                 "scatter_color",
                 "Select scatter plot color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.tags.main(
@@ -935,7 +1171,7 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "barplot_color",
                 "Select bar plot color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.tags.main(
@@ -969,18 +1205,13 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "lineplot_type",
                 "Select line plot type:",
-                choices=[
-                    "Linear Trend",
-                    "Exponential Growth",
-                    "Sinusoidal Pattern",
-                    "Random Walk",
-                ],
+                choices=_LINEPLOT_CHOICES,
                 selected="Linear Trend",
             ),
             ui.input_select(
                 "lineplot_color",
                 "Select line plot color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.tags.main(
@@ -1014,11 +1245,7 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "heatmap_type",
                 "Select heatmap type:",
-                choices=[
-                    "Random",
-                    "Correlated",
-                    "Checkerboard",
-                ],
+                choices=_HEATMAP_CHOICES,
                 selected="Random",
             ),
             ui.tags.main(
@@ -1052,18 +1279,13 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "multiline_type",
                 "Select multiline plot type:",
-                choices=[
-                    "Simple Trends",
-                    "Seasonal Patterns",
-                    "Growth Comparison",
-                    "Random Series",
-                ],
+                choices=_MULTILINE_CHOICES,
                 selected="Simple Trends",
             ),
             ui.input_select(
                 "multiline_color",
                 "Select color palette:",
-                choices=["Default", "Colorful", "Pastel", "Dark Tones", "Paired Colors", "Rainbow"],
+                choices=_MULTILINE_PALETTES,
                 selected="Default",
             ),
             ui.tags.main(
@@ -1097,23 +1319,19 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "multilayer_background_type",
                 "Select background plot type:",
-                choices=[
-                    "Bar Plot",
-                    "Histogram",
-                    "Scatter Plot"
-                ],
+                choices=_MULTILAYER_BACKGROUND_CHOICES,
                 selected="Bar Plot",
             ),
             ui.input_select(
                 "multilayer_background_color",
                 "Select background color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.input_select(
                 "multilayer_line_color",
                 "Select line color:",
-                choices=list(color_palettes.keys()),
+                choices=_COLOR_KEYS,
                 selected="Default",
             ),
             ui.tags.main(
@@ -1176,24 +1394,13 @@ app_ui = ui.page_fluid(
             ui.input_select(
                 "candlestick_company",
                 "Select company:",
-                choices=[
-                    "Tesla",
-                    "Apple", 
-                    "NVIDIA",
-                    "Microsoft",
-                    "Google",
-                    "Amazon",
-                ],
+                choices=_CANDLESTICK_COMPANIES,
                 selected="Tesla",
             ),
             ui.input_select(
                 "candlestick_timeframe",
                 "Select timeframe:",
-                choices=[
-                    "Daily",
-                    "Monthly",
-                    "Yearly",
-                ],
+                choices=_CANDLESTICK_TIMEFRAMES,
                 selected="Daily",
             ),
             ui.tags.main(
@@ -1236,9 +1443,12 @@ app_ui = ui.page_fluid(
 
 # Define the server logic
 def server(input, output, session):
+    # The parsed upload with its column lists and dtype summary (an UploadedData)
     uploaded_data = reactive.Value(None)
-    # Add a reactive value to store multiline plot data
-    multiline_data = reactive.Value(None)
+    # Multiline plot data, recomputed only when the multiline type changes
+    @reactive.calc
+    def multiline_data():
+        return plots.generate_multiline_data(input.multiline_type())
     # Add reactive value to store the current figure
     current_figure = reactive.Value(None)
     # Add reactive value to store the current maidr object
@@ -1249,6 +1459,9 @@ def server(input, output, session):
     # Reactive value to store the last saved file path
     last_saved_file = reactive.Value(None)
 
+    # Practice plot axes built for the current upload, keyed by custom_plot_spec()
+    custom_plot_cache = OrderedDict()
+
     # Helper function to announce messages to screen readers
     async def announce_to_screen_reader(message):
         """Send ARIA announcements to screen readers"""
@@ -1286,10 +1499,7 @@ def server(input, output, session):
         try:
             # Get the current figure
             fig = current_figure.get()
-            if fig is None:
-                fig = plt.gcf()
-            
-            if not fig or not fig.get_axes():
+            if fig is None or not fig.get_axes():
                 await announce_to_screen_reader("No plot available to generate embed code")
                 await session.send_custom_message("show_alert", {"type":"warning", "message":"No plot available. Please generate a plot before creating embed code."})
                 return
@@ -1431,11 +1641,19 @@ def server(input, output, session):
             await session.send_custom_message("copy_text_to_clipboard", code)
             await announce_to_screen_reader("Embed code copied to clipboard")
 
-    # Update the theme based on the selected option
+    # Last theme sent to the browser, so repeated values are not re-sent
+    prev_theme = reactive.Value(None)
+
+    # Update the theme based on the selected option; the page already loads in
+    # the default light theme, so the initial value is not sent
     @reactive.effect
-    @reactive.event(input.theme)
+    @reactive.event(input.theme, ignore_init=True)
     async def update_theme():
-        await session.send_custom_message("update_theme", input.theme())
+        theme = input.theme()
+        if theme == prev_theme.get():
+            return
+        prev_theme.set(theme)
+        await session.send_custom_message("update_theme", theme)
 
     # Generic function to create HTML content and trigger download
     async def trigger_html_download(plot_type_suffix):
@@ -1443,10 +1661,7 @@ def server(input, output, session):
         try:
             # Get the current figure
             fig = current_figure.get()
-            if fig is None:
-                fig = plt.gcf()
-            
-            if not fig or not fig.get_axes():
+            if fig is None or not fig.get_axes():
                 await announce_to_screen_reader("No plot available to download")
                 await session.send_custom_message("show_alert", {"type":"warning", "message":"No plot available. Please generate a plot before creating embed code."})
                 return
@@ -1573,7 +1788,8 @@ def server(input, output, session):
             # Announce plot generation
             await announce_to_screen_reader(f"Generating {distribution_type.lower()} histogram with {hist_color.lower()} color scheme")
             
-            ax = create_histogram(distribution_type, hist_color, theme)
+            args = (distribution_type, hist_color, theme)
+            ax = await draw_tutorial(("histogram", *args), plots.create_histogram, *args)
             print(f"create_histogram returned: {type(ax)}, value: {ax}")
             
             if ax is not None:
@@ -1601,10 +1817,11 @@ def server(input, output, session):
     # Box plot rendering
     @output
     @render_maidr
-    def create_boxplot_output():
+    async def create_boxplot_output():
         """Create and render box plot"""
         try:
-            ax = create_boxplot(input.boxplot_type(), input.boxplot_color(), input.theme())
+            args = (input.boxplot_type(), input.boxplot_color(), input.theme())
+            ax = await draw_tutorial(("boxplot", *args), plots.create_boxplot, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1620,10 +1837,11 @@ def server(input, output, session):
     # Scatter plot rendering
     @output
     @render_maidr
-    def create_scatterplot_output():
+    async def create_scatterplot_output():
         """Create and render scatter plot"""
         try:
-            ax = create_scatterplot(input.scatterplot_type(), input.scatter_color(), input.theme())
+            args = (input.scatterplot_type(), input.scatter_color(), input.theme())
+            ax = await draw_tutorial(("scatterplot", *args), plots.create_scatterplot, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1639,10 +1857,11 @@ def server(input, output, session):
     # Bar plot rendering
     @output
     @render_maidr
-    def create_barplot_output():
+    async def create_barplot_output():
         """Create and render bar plot"""
         try:
-            ax = create_barplot(input.barplot_color(), input.theme())
+            args = (input.barplot_color(), input.theme())
+            ax = await draw_tutorial(("barplot", *args), plots.create_barplot, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1658,10 +1877,11 @@ def server(input, output, session):
     # Line plot rendering
     @output
     @render_maidr
-    def create_lineplot_output():
+    async def create_lineplot_output():
         """Create and render line plot"""
         try:
-            ax = create_lineplot(input.lineplot_type(), input.lineplot_color(), input.theme())
+            args = (input.lineplot_type(), input.lineplot_color(), input.theme())
+            ax = await draw_tutorial(("lineplot", *args), plots.create_lineplot, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1677,10 +1897,11 @@ def server(input, output, session):
     # Heatmap rendering
     @output
     @render_maidr
-    def create_heatmap_output():
+    async def create_heatmap_output():
         """Create and render heatmap"""
         try:
-            ax = create_heatmap(input.heatmap_type(), input.theme())
+            args = (input.heatmap_type(), input.theme())
+            ax = await draw_tutorial(("heatmap", *args), plots.create_heatmap, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1696,13 +1917,14 @@ def server(input, output, session):
     # Multiline plot rendering
     @output
     @render_maidr
-    def create_multiline_plot_output():
+    async def create_multiline_plot_output():
         """Create and render multiline plot"""
         try:
-            data = generate_multiline_data(input.multiline_type())
-            multiline_data.set(data)
+            data = multiline_data()
             
-            ax = create_multiline_plot(data, input.multiline_type(), input.multiline_color(), input.theme())
+            args = (input.multiline_type(), input.multiline_color(), input.theme())
+            # The data is fixed per multiline type, so the type stands in for it in the key
+            ax = await draw_tutorial(("multiline", *args), plots.create_multiline_plot, data, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1718,15 +1940,16 @@ def server(input, output, session):
     # Multilayer plot rendering
     @output
     @render_maidr
-    def create_multilayer_plot_output():
+    async def create_multilayer_plot_output():
         """Create and render multilayer plot"""
         try:
-            ax = create_multilayer_plot(
+            args = (
                 input.multilayer_background_type(), 
                 input.multilayer_background_color(), 
                 input.multilayer_line_color(), 
-                input.theme()
+                input.theme(),
             )
+            ax = await draw_tutorial(("multilayer", *args), plots.create_multilayer_plot, *args)
             if ax is not None:
                 # Check if ax is actually an axes object, not a list
                 if isinstance(ax, list):
@@ -1742,10 +1965,11 @@ def server(input, output, session):
     # Multipanel plot rendering
     @output
     @render_maidr
-    def create_multipanel_plot_output():
+    async def create_multipanel_plot_output():
         """Create and render multipanel plot"""
         try:
-            ax = create_multipanel_plot("default", "default", input.theme())
+            args = ("default", "default", input.theme())
+            ax = await draw_tutorial(("multipanel", *args), plots.create_multipanel_plot, *args)
             print(f"create_multipanel_plot returned: {type(ax)}, value: {ax}")
             
             if ax is not None:
@@ -1771,20 +1995,22 @@ def server(input, output, session):
     # Candlestick Chart
     @output
     @render_maidr 
-    def create_candlestick_output():
+    async def create_candlestick_output():
         try:
             candlestick_company = input.candlestick_company()
             candlestick_timeframe = input.candlestick_timeframe()
             theme = input.theme()
             
             # Create the candlestick plot
-            ax = create_candlestick(candlestick_company, candlestick_timeframe, theme)
+            args = (candlestick_company, candlestick_timeframe, theme)
+            ax = await draw_tutorial(("candlestick", *args), plots.create_candlestick, *args)
             
             if ax is None:
                 return None
                 
-            # Store the current figure for HTML saving using plt.gcf()
-            current_figure.set(plt.gcf())
+            # Store the current figure for HTML saving (the cached axes may not
+            # belong to pyplot's current figure)
+            current_figure.set(ax.figure)
             
             # For MAIDR rendering, return the axes object directly
             return ax
@@ -1800,8 +2026,14 @@ def server(input, output, session):
         if input.file_upload() is not None:
             try:
                 file_info = input.file_upload()[0]
-                df = pd.read_csv(file_info["datapath"])
-                uploaded_data.set(df)
+                # Columns are classified once per file rather than on every re-render.
+                # Parse on the drawing thread so a large file does not stall the event
+                # loop; its single worker also keeps the CSV cache to one thread.
+                data = await run_plot_task(load_csv, file_info["datapath"])
+                if data is not uploaded_data.get():
+                    custom_plot_cache.clear()
+                uploaded_data.set(data)
+                df = data.df
                 await announce_to_screen_reader(f"File uploaded successfully with {len(df)} rows and {len(df.columns)} columns")
             except Exception as e:
                 await announce_to_screen_reader(f"Error uploading file: {str(e)}")
@@ -1812,14 +2044,9 @@ def server(input, output, session):
     @render.table
     def data_types():
         """Display data types of uploaded file"""
-        df = uploaded_data.get()
-        if df is not None:
-            summary = pd.DataFrame({
-                'Column': df.columns,
-                'Type': [str(df[col].dtype) for col in df.columns],
-                'Non-null': [df[col].count() for col in df.columns]
-            })
-            return summary
+        data = uploaded_data.get()
+        if data is not None:
+            return data.summary
         return pd.DataFrame()
 
     # Plot options dropdown
@@ -1827,154 +2054,139 @@ def server(input, output, session):
     @render.ui
     def plot_options():
         """Render plot type selection dropdown"""
-        df = uploaded_data.get()
-        if df is not None:
-            return ui.input_select(
-                "plot_type",
-                "Select plot type:",
-                choices=[""] + [
-                    "Histogram",
-                    "Box Plot", 
-                    "Scatter Plot",
-                    "Bar Plot",
-                    "Line Plot",
-                    "Heatmap"
-                ]
-            )
+        if uploaded_data.get() is not None:
+            return _PLOT_TYPE_SELECT
         return ui.div()
 
-    # Variable input based on plot type
-    @output
-    @render.ui
-    def variable_input():
-        """Render variable selection based on plot type"""
-        df = uploaded_data.get()
+    # Numeric and categorical selectors for each plot type, by input id
+    numeric_selects = ("hist_var_x", "boxplot_var_x", "scatter_var_x", "scatter_var_y", "lineplot_var_x", "lineplot_var_y")
+    categorical_selects = ("barplot_var_x", "heatmap_var_x", "heatmap_var_y")
+
+    # Refresh the variable choices in place once per upload
+    @reactive.effect
+    @reactive.event(uploaded_data, ignore_init=True)
+    def update_variable_choices():
+        """Fill the static variable selectors with the uploaded file's columns"""
+        data = uploaded_data.get()
+        numeric_cols = data.numeric_vars
+        categorical_cols = data.categorical_vars
+        for input_id in numeric_selects:
+            ui.update_select(input_id, choices=with_placeholder(numeric_cols), selected="")
+        for input_id in categorical_selects:
+            ui.update_select(input_id, choices=with_placeholder(categorical_cols), selected="")
+        ui.update_select("boxplot_var_y", choices=with_placeholder(categorical_cols, "None"), selected="None")
+        ui.update_select("heatmap_var_value", choices=with_placeholder(numeric_cols, "None"), selected="None")
+
+    # Heatmap needs distinct X and Y, so narrow the Y choices when X changes
+    @reactive.effect
+    @reactive.event(input.heatmap_var_x, ignore_init=True)
+    def update_heatmap_y_choices():
+        """Drop the selected X variable from the heatmap's Y choices"""
+        var_x = input.heatmap_var_x()
+        var_y = input.heatmap_var_y()
+        data = uploaded_data.get()
+        categorical_cols = data.categorical_vars if data is not None else ()
+        choices = [""] + [col for col in categorical_cols if col != var_x]
+        ui.update_select("heatmap_var_y", choices=choices, selected=var_y if var_y in choices else "")
+
+    # The Practice plot type with the selections it reads, settled so that quickly
+    # flipping through the dropdowns builds only the last combination
+    @debounce(_CUSTOM_PLOT_DEBOUNCE_SECS)
+    def custom_plot_spec():
         plot_type = getattr(input, 'plot_type', lambda: None)()
-        
-        if df is not None and plot_type:
-            # Robust dtype detection – numeric vs non-numeric
-            numeric_cols = df.select_dtypes(include='number').columns.tolist()
-            categorical_cols = df.select_dtypes(exclude='number').columns.tolist()
-            
-            if plot_type == "Histogram":
-                return ui.div(
-                    ui.input_select("var_x", "Select numeric variable:", choices=[""] + numeric_cols),
-                    ui.input_select("hist_custom_color", "Select color:", choices=list(color_palettes.keys()), selected="Default")
-                )
-            elif plot_type == "Box Plot":
-                return ui.div(
-                    ui.input_select("var_x", "Select numeric variable:", choices=[""] + numeric_cols),
-                    ui.input_select("var_y", "Select grouping variable (optional):", choices=["None"] + categorical_cols, selected="None"),
-                    ui.input_select("boxplot_custom_color", "Select color:", choices=list(color_palettes.keys()), selected="Default")
-                )
-            elif plot_type == "Scatter Plot":
-                # Provide all numeric columns for both axes (allow same variable)
-                y_choices = numeric_cols
-                return ui.div(
-                    ui.input_select("var_x", "Select X variable:", choices=[""] + numeric_cols),
-                    ui.input_select("var_y", "Select Y variable:", choices=[""] + y_choices),
-                    ui.input_select("scatter_custom_color", "Select color:", choices=list(color_palettes.keys()), selected="Default")
-                )
-            elif plot_type == "Bar Plot":
-                return ui.div(
-                    ui.input_select("var_x", "Select categorical variable:", choices=[""] + categorical_cols),
-                    ui.input_select("barplot_custom_color", "Select color:", choices=list(color_palettes.keys()), selected="Default")
-                )
-            elif plot_type == "Line Plot":
-                # Provide all numeric columns for both axes (allow same variable)
-                y_choices = numeric_cols
-                return ui.div(
-                    ui.input_select("var_x", "Select X variable:", choices=[""] + numeric_cols),
-                    ui.input_select("var_y", "Select Y variable:", choices=[""] + y_choices),
-                    ui.input_select("lineplot_custom_color", "Select color:", choices=list(color_palettes.keys()), selected="Default")
-                )
-            elif plot_type == "Heatmap":
-                return ui.div(
-                    ui.input_select("var_x", "Select X (categorical):", choices=[""] + categorical_cols),
-                    ui.input_select("var_y", "Select Y (categorical):", choices=[""] + categorical_cols),
-                    ui.input_select("var_value", "Select numeric value (optional):", choices=["None"] + numeric_cols, selected="None")
-                )
-        return ui.div()
+        if plot_type not in _CUSTOM_PLOT_INPUTS:
+            return (plot_type, (), None, input.theme())
+        var_ids, color_id = _CUSTOM_PLOT_INPUTS[plot_type]
+        variables = tuple(input[var_id]() for var_id in var_ids)
+        color_name = input[color_id]() if color_id else None
+        return (plot_type, variables, color_name, input.theme())
 
     # Custom plot creation
     @output
     @render_maidr
-    def create_custom_plot():
+    async def create_custom_plot():
         """Create custom plot based on user data and selections"""
-        df = uploaded_data.get()
-        plot_type = getattr(input, 'plot_type', lambda: None)()
+        data = uploaded_data.get()
+        df = data.df if data is not None else None
+        spec = custom_plot_spec()
+        plot_type, variables, color_name, theme = spec
         
-        if df is None or not plot_type or plot_type == "":
+        # Pick the builder and its arguments first, so that a plot type whose
+        # required variables are not chosen yet returns without any plotting work
+        builder, args = None, ()
+        if df is not None and not df.empty:
+            color = color_palettes.get(color_name, 'skyblue')
+            if plot_type == "Histogram" and variables[0]:
+                builder, args = plots.create_custom_histogram, (variables[0], color)
+            elif plot_type == "Box Plot" and variables[0]:
+                var_x, var_y = variables
+                var_y = None if var_y == 'None' or var_y == "" else var_y
+                builder, args = plots.create_custom_boxplot, (var_x, var_y, color)
+            elif plot_type == "Scatter Plot" and all(variables):
+                builder, args = plots.create_custom_scatterplot, (*variables, color)
+            elif plot_type == "Bar Plot" and variables[0]:
+                builder, args = plots.create_custom_barplot, (variables[0], color)
+            elif plot_type == "Line Plot" and all(variables):
+                builder, args = plots.create_custom_lineplot, (*variables, color)
+            elif plot_type == "Heatmap":
+                var_x, var_y, var_value = variables
+                var_value = None if var_value == 'None' or var_value == '' else var_value
+                if var_x and var_y and var_x != var_y:
+                    builder, args = plots.create_custom_heatmap, (var_x, var_y, var_value, 'YlGnBu')
+            # Selections left over from a previous upload can name columns this
+            # frame lacks; skip them here instead of letting the builder raise
+            columns = df.columns
+            if builder is not None and not all(var in columns for var in variables if var and var != 'None'):
+                builder = None
+
+        if builder is None:
             current_figure.set(None)
             plot_available.set(False)
             return None
-            
-        try:
-            ax = None
-            
-            if plot_type == "Histogram" and hasattr(input, 'var_x') and input.var_x() and input.var_x() != "":
-                color = color_palettes.get(getattr(input, 'hist_custom_color', lambda: 'Default')(), 'skyblue')
-                ax = create_custom_histogram(df, input.var_x(), color, input.theme())
-                
-            elif plot_type == "Box Plot" and hasattr(input, 'var_x') and input.var_x() and input.var_x() != "":
-                color = color_palettes.get(getattr(input, 'boxplot_custom_color', lambda: 'Default')(), 'skyblue')
-                var_y = getattr(input, 'var_y', lambda: 'None')()
-                var_y = None if var_y == 'None' or var_y == "" else var_y
-                ax = create_custom_boxplot(df, input.var_x(), var_y, color, input.theme())
-                
-            elif plot_type == "Scatter Plot" and hasattr(input, 'var_x') and hasattr(input, 'var_y') and input.var_x() and input.var_y() and input.var_x() != "" and input.var_y() != "":
-                color = color_palettes.get(getattr(input, 'scatter_custom_color', lambda: 'Default')(), 'skyblue')
-                ax = create_custom_scatterplot(df, input.var_x(), input.var_y(), color, input.theme())
-                
-            elif plot_type == "Bar Plot" and hasattr(input, 'var_x') and input.var_x() and input.var_x() != "":
-                color = color_palettes.get(getattr(input, 'barplot_custom_color', lambda: 'Default')(), 'skyblue')
-                ax = create_custom_barplot(df, input.var_x(), color, input.theme())
-            
-            elif plot_type == "Line Plot" and all(hasattr(input, v) for v in ['var_x','var_y']) and input.var_x() and input.var_y():
-                color = color_palettes.get(getattr(input, 'lineplot_custom_color', lambda: 'Default')(), 'skyblue')
-                ax = create_custom_lineplot(df, input.var_x(), input.var_y(), color, input.theme())
-            
-            elif plot_type == "Heatmap" and all(hasattr(input, v) for v in ['var_x','var_y']):
-                var_x = input.var_x()
-                var_y = input.var_y()
-                var_value = getattr(input, 'var_value', lambda: 'None')()
-                var_value = None if var_value == 'None' or var_value == '' else var_value
-                if var_x and var_y and var_x != '' and var_y != '' and var_x != var_y:
-                    ax = create_custom_heatmap(df, var_x, var_y, var_value, 'YlGnBu', input.theme())
-            
-            if ax is not None:
-                # Check if ax is actually an axes object, not a list
-                if isinstance(ax, list):
-                    print(f"ERROR: Custom plot function returned a list instead of axes object: {type(ax)}")
-                    plot_available.set(False)
-                    return None
-                fig = ax.figure
-                current_figure.set(fig)
-                plot_available.set(True)
-                return ax
-                
-        except Exception as e:
-            print(f"Error creating custom plot: {e}")
+
+        # A selection seen before for this upload (e.g. toggling the theme back)
+        # reuses the axes built then instead of plotting again
+        ax = custom_plot_cache.get(spec)
+        if ax is not None:
+            custom_plot_cache.move_to_end(spec)
+        else:
+            try:
+                # Same drawing thread as the tutorial tabs: the builders switch the
+                # global pyplot style, so two draws must never overlap
+                ax = await run_plot_task(builder, df, *args, theme)
+            except Exception as e:
+                print(f"Error creating custom plot: {e}")
+                plot_available.set(False)
+                return None
+
+        if ax is None:
+            plot_available.set(False)
+            return None
+        # Check if ax is actually an axes object, not a list
+        if isinstance(ax, list):
+            print(f"ERROR: Custom plot function returned a list instead of axes object: {type(ax)}")
             plot_available.set(False)
             return None
+        custom_plot_cache[spec] = ax
+        if len(custom_plot_cache) > _CUSTOM_PLOT_CACHE_SIZE:
+            custom_plot_cache.popitem(last=False)
+        fig = ax.figure
+        current_figure.set(fig)
+        plot_available.set(True)
+        return ax
 
     # Generic SVG download handler and per-tab triggers
     async def trigger_svg_download(plot_type_suffix):
         """Generate SVG in-memory and send to browser for download."""
         try:
             fig = current_figure.get()
-            if fig is None:
-                fig = plt.gcf()
-            if not fig or not fig.get_axes():
+            if fig is None or not fig.get_axes():
                 await announce_to_screen_reader("No plot available to download")
                 await session.send_custom_message("show_alert", {"type":"warning", "message":"No plot available. Please generate a plot before creating embed code."})
                 return
 
-            import io, codecs
-            buffer = io.StringIO()
-            fig.savefig(buffer, format='svg', bbox_inches='tight')
-            svg_content = buffer.getvalue()
-            buffer.close()
+            # Serialize off the event loop, which may wait on another render's lock
+            svg_content = await run_plot_task(figure_svg, fig)
 
             # Generate filename using new scheme: titleofplot_plottype_timestamp
             plot_title = "plot"
@@ -2067,26 +2279,39 @@ def server(input, output, session):
         except:
             pass
     
-    @reactive.effect
-    async def announce_histogram_changes():
+    def announce_when_settled(describe):
+        """Announce the message built by describe() once the inputs it reads have
+        settled, so flipping through a select sends one announcement, not one per step"""
+        settled = debounce(_ANNOUNCE_DEBOUNCE_SECS)(describe)
+
+        @reactive.effect
+        async def announce():
+            message = settled()
+            if message:
+                await announce_to_screen_reader(message)
+
+        return describe
+
+    @announce_when_settled
+    def histogram_changes():
         distribution_type = input.distribution_type()
         hist_color = input.hist_color()
         if distribution_type and hist_color:
-            await announce_to_screen_reader(f"Histogram settings updated: {distribution_type} distribution with {hist_color} colors")
+            return f"Histogram settings updated: {distribution_type} distribution with {hist_color} colors"
 
-    @reactive.effect
-    async def announce_boxplot_changes():
+    @announce_when_settled
+    def boxplot_changes():
         boxplot_type = input.boxplot_type()
         boxplot_color = input.boxplot_color()
         if boxplot_type and boxplot_color:
-            await announce_to_screen_reader(f"Box plot settings updated: {boxplot_type} with {boxplot_color} colors")
+            return f"Box plot settings updated: {boxplot_type} with {boxplot_color} colors"
 
-    @reactive.effect
-    async def announce_scatter_changes():
+    @announce_when_settled
+    def scatter_changes():
         scatterplot_type = input.scatterplot_type()
         scatter_color = input.scatter_color()
         if scatterplot_type and scatter_color:
-            await announce_to_screen_reader(f"Scatter plot settings updated: {scatterplot_type} with {scatter_color} colors")
+            return f"Scatter plot settings updated: {scatterplot_type} with {scatter_color} colors"
 
     # Add reactive effect to update button states
     @reactive.effect
@@ -2111,9 +2336,6 @@ def server(input, output, session):
 # Function to extract embed content from full HTML
 def extract_embed_content(html_content):
     """Extract div content and wrap in iframe with sandbox for secure embedding"""
-    import re
-    import html
-    
     # Find the content between <body> and </body>
     body_match = re.search(r'<body[^>]*>(.*?)</body>', html_content, re.DOTALL | re.IGNORECASE)
     
@@ -0,0 +1,46 @@
+"""
+Plot builders for the A11Y Dashboard.
+
+The builders are looked up lazily (PEP 562), so a plot module, and seaborn
+with it, is only imported the first time one of its functions is used.
+"""
+
+import importlib
+
+# Public builder name -> the plots submodule that defines it
+_BUILDERS = {
+    "create_histogram": "histogram",
+    "create_custom_histogram": "histogram",
+    "create_boxplot": "boxplot",
+    "create_custom_boxplot": "boxplot",
+    "create_scatterplot": "scatterplot",
+    "create_custom_scatterplot": "scatterplot",
+    "create_barplot": "barplot",
+    "create_custom_barplot": "barplot",
+    "create_lineplot": "lineplot",
+    "create_custom_lineplot": "lineplot",
+    "create_heatmap": "heatmap",
+    "create_custom_heatmap": "heatmap",
+    "generate_multiline_data": "multilineplot",
+    "create_multiline_plot": "multilineplot",
+    "create_custom_multiline_plot": "multilineplot",
+    "create_multilayer_plot": "multilayerplot",
+    "create_custom_multilayer_plot": "multilayerplot",
+    "create_multipanel_plot": "multipanelplot",
+    "create_custom_multipanel_plot": "multipanelplot",
+    "create_candlestick": "candlestick",
+}
+
+__all__ = list(_BUILDERS)
+
+def __getattr__(name):
+    """Import the submodule defining a builder on first access"""
+    if name not in _BUILDERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_BUILDERS[name]}"), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,16 +1,23 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from plots.utils import set_plot_theme, color_palettes
+from functools import lru_cache
+from plots.utils import get_plot_axes, color_palettes, make_rng, axis_label
+
+@lru_cache(maxsize=None)
+def _bar_values():
+    """Generate the bar heights once, so colour and theme changes keep the same bars"""
+    rng = make_rng("barplot")
+    values = rng.integers(10, 100, size=5)
+    values.flags.writeable = False
+    return values
 
 def create_barplot(input_barplot_color, theme):
     """Create a bar plot based on input parameters"""
     color = color_palettes[input_barplot_color]
     categories = ["Category A", "Category B", "Category C", "Category D", "Category E"]
-    values = np.random.randint(10, 100, size=5)
+    values = _bar_values()
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     sns.barplot(x=categories, y=values, ax=ax, color=color)
     ax.set_title("Plot of Categories")
     ax.set_xlabel("Categories")
@@ -23,11 +30,10 @@ def create_custom_barplot(df, var, color, theme):
     if not var or df is None:
         return None
         
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     sns.countplot(data=df, x=var, color=color, ax=ax)
     ax.set_title(f"{var}")
-    ax.set_xlabel(var.replace("_", " ").title())
+    ax.set_xlabel(axis_label(var))
     ax.set_ylabel("Count")
     
     return ax
\ No newline at end of file
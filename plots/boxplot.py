@@ -1,30 +1,97 @@
-import matplotlib.pyplot as plt
+import matplotlib
 import numpy as np
 import seaborn as sns
-from plots.utils import set_plot_theme, color_palettes
+from colorsys import rgb_to_hls
+from functools import lru_cache
+from plots.utils import get_plot_axes, key_rng, color_palettes, axis_label, label_axes
+
+# `orientation` replaced the `vert` flag of Axes.bxp in Matplotlib 3.10
+if matplotlib.__version_info__ >= (3, 10):
+    _HORIZONTAL = {"orientation": "horizontal"}
+else:
+    _HORIZONTAL = {"vert": False}
+
+def _symmetric_without_outliers(rng):
+    """Draw normal data restricted to a strict range to avoid outliers"""
+    data = rng.normal(loc=0, scale=1, size=1000)
+    return data[np.abs(data) < 1.5]
+
+# Sample generator for each box plot type
+_BOX_GEN = {
+    "Positively Skewed with Outliers": lambda rng: rng.lognormal(mean=0, sigma=0.5, size=1000),
+    "Negatively Skewed with Outliers": lambda rng: -rng.lognormal(mean=0, sigma=0.5, size=1000),
+    "Symmetric with Outliers": lambda rng: rng.normal(loc=0, scale=1, size=1000),
+    "Symmetric without Outliers": _symmetric_without_outliers,
+}
+
+@lru_cache(maxsize=None)
+def _box_data(kind):
+    """Generate the sample data for a box plot type (cached per type)"""
+    data = _BOX_GEN.get(kind, _BOX_GEN["Symmetric with Outliers"])(key_rng("boxplot", kind))
+    data.flags.writeable = False
+    return data
+
+def _tukey_stats(data, label=""):
+    """Compute Tukey box plot statistics (1.5 IQR whiskers) from a single sort,
+    or None for an empty sample, which has no box to draw"""
+    ordered = np.sort(data)
+    n = ordered.size
+    if n == 0:
+        return None
+    # Linear-interpolated quartiles read straight off the sorted data
+    pos = np.array((0.25, 0.5, 0.75)) * (n - 1)
+    lo = pos.astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    q1, med, q3 = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    iqr = q3 - q1
+    # Everything outside [start, stop) lies beyond the whiskers
+    start = np.searchsorted(ordered, q1 - 1.5 * iqr, side="left")
+    stop = np.searchsorted(ordered, q3 + 1.5 * iqr, side="right")
+    return {
+        "label": label,
+        "mean": ordered.mean(),
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": ordered[start],
+        "whishi": ordered[stop - 1],
+        "fliers": np.concatenate((ordered[:start], ordered[stop:])),
+    }
+
+@lru_cache(maxsize=None)
+def _box_stats(kind):
+    """Compute the box plot statistics for a box plot type (cached per type)"""
+    return _tukey_stats(_box_data(kind))
+
+def _draw_box(ax, stats, color, vertical=False):
+    """Draw a list of precomputed box statistics with the same styling as sns.boxplot"""
+    face = sns.desaturate(color, 0.75)
+    lum = rgb_to_hls(*face)[1] * 0.6
+    line = (lum, lum, lum)
+    ax.bxp(
+        stats,
+        positions=range(len(stats)),
+        widths=0.8,
+        capwidths=0.4,
+        patch_artist=True,
+        boxprops={"facecolor": face, "edgecolor": line, "linewidth": 1},
+        whiskerprops={"color": line, "linewidth": 1},
+        capprops={"color": line, "linewidth": 1},
+        medianprops={"color": line, "linewidth": 1},
+        flierprops={"marker": "o", "markerfacecolor": "none", "markeredgecolor": line},
+        **({} if vertical else _HORIZONTAL),
+    )
 
 def create_boxplot(input_boxplot_type, input_boxplot_color, theme):
     """Create a box plot based on input parameters"""
     boxplot_type = input_boxplot_type
     color = color_palettes[input_boxplot_color]
 
-    # Generate data based on the selected box plot type
-    if boxplot_type == "Positively Skewed with Outliers":
-        data = np.random.lognormal(mean=0, sigma=0.5, size=1000)
-    elif boxplot_type == "Negatively Skewed with Outliers":
-        data = -np.random.lognormal(mean=0, sigma=0.5, size=1000)
-    elif boxplot_type == "Symmetric with Outliers":
-        data = np.random.normal(loc=0, scale=1, size=1000)
-    elif boxplot_type == "Symmetric without Outliers":
-        data = np.random.normal(loc=0, scale=1, size=1000)
-        data = data[(data > -1.5) & (data < 1.5)]  # Strict range to avoid outliers
-    else:
-        data = np.random.normal(loc=0, scale=1, size=1000)
+    stats = _box_stats(boxplot_type)
 
     # Create the plot using matplotlib
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
-    sns.boxplot(x=data, ax=ax, color=color)  # Horizontal box plot
+    fig, ax = get_plot_axes(theme=theme)
+    _draw_box(ax, [stats], color)  # Horizontal box plot
     ax.set_title(f"{boxplot_type}")
     ax.set_xlabel("Value")
 
@@ -35,18 +102,25 @@ def create_custom_boxplot(df, var_x, var_y, color, theme):
     if df is None:
         return None
         
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     
     if var_x and var_y:
-        sns.boxplot(x=var_y, y=var_x, data=df, palette=[color], ax=ax)
+        # One box per group, in order of first appearance like seaborn
+        groups = df[[var_y, var_x]].dropna().groupby(var_y, sort=False)[var_x]
+        stats = [_tukey_stats(values.to_numpy(dtype=float), label=str(name)) for name, values in groups]
+        # Groups without any values get no box, as in seaborn
+        stats = [box for box in stats if box is not None]
+        if stats:
+            _draw_box(ax, stats, color, vertical=True)
         ax.set_title(f"{var_x} grouped by {var_y}")
-        ax.set_xlabel(var_y.replace("_", " ").title())
-        ax.set_ylabel(var_x.replace("_", " ").title())
+        label_axes(ax, var_y, var_x)
     elif var_x:
-        sns.boxplot(y=df[var_x], color=color, ax=ax)
+        stats = _tukey_stats(df[var_x].dropna().to_numpy(dtype=float))
+        # An all-missing column leaves an empty axis, as seaborn drew it
+        if stats is not None:
+            _draw_box(ax, [stats], color, vertical=True)
         ax.set_title(f"{var_x}")
-        ax.set_ylabel(var_x.replace("_", " ").title())
+        ax.set_ylabel(axis_label(var_x))
     else:
         return None
         
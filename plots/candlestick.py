@@ -3,7 +3,7 @@ import matplotlib.dates as mdates
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
-from plots.utils import set_plot_theme, color_palettes
+from plots.utils import set_plot_theme, get_plot_axes, color_palettes
 
 # Try to import mplfinance. If it is available we will leverage its high-level API
 # to draw the candlestick together with moving-average lines and a volume subplot.
@@ -40,8 +40,8 @@ def generate_stock_data(
     Dict[str, List]
         Dictionary with OHLCV data
     """
-    if seed is not None:
-        np.random.seed(seed)
+    # A local generator keeps the series reproducible without touching global state
+    rng = np.random.default_rng(seed)
     
     # Company-specific parameters
     company_params = {
@@ -76,7 +76,7 @@ def generate_stock_data(
             opens.append(closes[i - 1])
         
         # Generate price change with some drift
-        price_change = np.random.normal(0, volatility * opens[i])
+        price_change = rng.normal(0, volatility * opens[i])
         
         # Add some mean reversion
         if opens[i] > start_price * 1.2:
@@ -89,8 +89,8 @@ def generate_stock_data(
         
         # Generate high and low
         daily_range = abs(price_change) + (volatility * opens[i])
-        high = max(opens[i], close) + abs(np.random.normal(0, daily_range / 3))
-        low = min(opens[i], close) - abs(np.random.normal(0, daily_range / 3))
+        high = max(opens[i], close) + abs(rng.normal(0, daily_range / 3))
+        low = min(opens[i], close) - abs(rng.normal(0, daily_range / 3))
         
         highs.append(round(high, 2))
         lows.append(round(low, 2))
@@ -98,7 +98,7 @@ def generate_stock_data(
         # Generate volume
         base_volume = 1000000
         vol_factor = 1.0 + 2.0 * (abs(price_change) / (volatility * opens[i]))
-        volume = int(base_volume * vol_factor * np.random.uniform(0.7, 1.3))
+        volume = int(base_volume * vol_factor * rng.uniform(0.7, 1.3))
         volumes.append(volume)
     
     return {
@@ -215,13 +215,12 @@ def create_candlestick_plot(
         set_plot_theme(fig, primary_ax, theme)
         fig.tight_layout()
 
-        return primary_ax  # MAIDR will still capture the full figure via plt.gcf()
+        return primary_ax  # MAIDR renders the full figure through primary_ax.figure
 
     #-----------------------------------------------------------------------------
     # Fallback: mplfinance is NOT available – draw manually as before
     #-----------------------------------------------------------------------------
-    fig, ax = plt.subplots(figsize=(12, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(figsize=(12, 6), theme=theme)
 
     # For fallback, adjust width based on timeframe for better visibility
     fallback_width = width
@@ -256,7 +255,7 @@ def create_candlestick_plot(
     ax.set_xlabel("Date", fontsize=12)
     ax.set_ylabel("Price ($)", fontsize=12)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return ax
 
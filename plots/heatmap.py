@@ -1,26 +1,40 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 import pandas as pd
-from plots.utils import set_plot_theme
+from functools import lru_cache
+from matplotlib import colormaps
+from plots.utils import get_plot_axes, key_rng, label_axes
+
+# Largest user heatmap (in cells) drawn with sns.heatmap and value annotations;
+# bigger ones are drawn as a single image
+_ANNOT_MAX_CELLS = 400
+
+# Fixed 5x5 checkerboard of alternating 0 and 1 cells
+_CHECKERBOARD = (np.add.outer(np.arange(5), np.arange(5)) & 1).astype(np.int8)
+_CHECKERBOARD.flags.writeable = False
+
+# Matrix generator for each heatmap type (5x5, reduced size)
+_HEATMAP_GEN = {
+    "Random": lambda rng: rng.random((5, 5)),
+    # Identity covariance, so the draws are plain i.i.d. standard normals
+    "Correlated": lambda rng: rng.standard_normal((5, 5)),
+    "Checkerboard": lambda rng: _CHECKERBOARD,
+}
+
+@lru_cache(maxsize=None)
+def _heatmap_data(kind):
+    """Generate the matrix for a heatmap type (cached per type)"""
+    data = _HEATMAP_GEN.get(kind, _HEATMAP_GEN["Random"])(key_rng("heatmap", kind))
+    data.flags.writeable = False
+    return data
 
 def create_heatmap(input_heatmap_type, theme):
     """Create a heatmap based on input parameters"""
     heatmap_type = input_heatmap_type
 
-    if heatmap_type == "Random":
-        data = np.random.rand(5, 5)  # Reduced size
-    elif heatmap_type == "Correlated":
-        data = np.random.multivariate_normal(
-            [0] * 5, np.eye(5), size=5
-        )  # Reduced size
-    elif heatmap_type == "Checkerboard":
-        data = np.indices((5, 5)).sum(axis=0) % 2  # Reduced size
-    else:
-        data = np.random.rand(5, 5)
+    data = _heatmap_data(heatmap_type)
 
-    fig, ax = plt.subplots(figsize=(10, 8))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(figsize=(10, 8), theme=theme)
     sns.heatmap(data, ax=ax, cmap="YlGnBu", annot=True, fmt=".2f")
     ax.set_title(f"{heatmap_type}")
 
@@ -31,25 +45,47 @@ def create_custom_heatmap(df, var_x, var_y, var_value, colorscale, theme):
     if not var_x or not var_y or df is None:
         return None
 
-    # Determine a valid colormap
-    import matplotlib.pyplot as _plt
-    if colorscale is None or (isinstance(colorscale, str) and (colorscale.startswith('#') or colorscale not in _plt.colormaps())):
+    # Determine a valid colormap (a registry lookup, not a sorted list of all names)
+    if colorscale is None or (isinstance(colorscale, str) and (colorscale.startswith('#') or colorscale not in colormaps)):
         cmap_to_use = 'YlGnBu'
     else:
         cmap_to_use = colorscale
 
-    fig, ax = plt.subplots(figsize=(10, 8))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(figsize=(10, 8), theme=theme)
 
     # Build aggregation table
     if var_value:
-        pivot_table = pd.pivot_table(df, values=var_value, index=var_y, columns=var_x, aggfunc='mean')
+        # Same table as pivot_table(aggfunc='mean'), without its reshape machinery;
+        # dropping empty groups matches pivot_table's dropna
+        means = df.groupby([var_y, var_x], observed=True)[var_value].mean()
+        pivot_table = means.dropna().unstack()
     else:
-        pivot_table = pd.crosstab(df[var_y], df[var_x], normalize='all')
+        # Same table as crosstab(normalize='all'): code both columns once (sorted,
+        # like crosstab's labels) and count every cell in a single bincount
+        keys = df[[var_y, var_x]].dropna()
+        row_codes, rows = pd.factorize(keys[var_y], sort=True)
+        col_codes, cols = pd.factorize(keys[var_x], sort=True)
+        counts = np.bincount(row_codes * len(cols) + col_codes, minlength=len(rows) * len(cols))
+        # Normalize on one float buffer rather than through DataFrame arithmetic
+        shares = counts.reshape(len(rows), len(cols)).astype(np.float64)
+        shares /= shares.sum()
+        pivot_table = pd.DataFrame(shares, index=pd.Index(rows, name=var_y),
+                                   columns=pd.Index(cols, name=var_x))
 
-    sns.heatmap(pivot_table, ax=ax, cmap=cmap_to_use, annot=True, fmt=".2f")
+    if pivot_table.size <= _ANNOT_MAX_CELLS:
+        sns.heatmap(pivot_table, ax=ax, cmap=cmap_to_use, annot=True, fmt=".2f")
+    else:
+        # Large grids are drawn as a single image rather than a mesh of cells, and
+        # without cell labels, which would be unreadable at this size
+        image = ax.imshow(pivot_table.to_numpy(dtype=np.float64), cmap=cmap_to_use,
+                          aspect="auto", interpolation="nearest")
+        # Every row and column keeps its label: MAIDR reads the category names from
+        # the tick labels, and falls back to bare indices if any are missing
+        rows, cols = pivot_table.shape
+        ax.set_xticks(np.arange(cols), [str(c) for c in pivot_table.columns], rotation=90, fontsize="x-small")
+        ax.set_yticks(np.arange(rows), [str(r) for r in pivot_table.index], fontsize="x-small")
+        fig.colorbar(image, ax=ax)
     ax.set_title(f"Heatmap of {var_y} vs {var_x}")
-    ax.set_xlabel(var_x.replace("_", " ").title())
-    ax.set_ylabel(var_y.replace("_", " ").title())
+    label_axes(ax, var_x, var_y)
 
     return ax
\ No newline at end of file
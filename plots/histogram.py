@@ -1,44 +1,92 @@
-import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
 import numpy as np
-import seaborn as sns
-from plots.utils import set_plot_theme, color_palettes
+from functools import lru_cache
+from plots.utils import get_plot_axes, key_rng, color_palettes, axis_label
+
+def _normal_mixture(rng, locs, sizes, scale):
+    """Draw consecutive normal segments into one buffer without concatenating"""
+    data = rng.standard_normal(sum(sizes))
+    data *= scale
+    start = 0
+    for loc, size in zip(locs, sizes):
+        data[start:start + size] += loc
+        start += size
+    return data
+
+# Sample generator for each distribution type
+_HIST_GEN = {
+    "Normal Distribution": lambda rng: rng.normal(size=1000),
+    "Positively Skewed": lambda rng: rng.exponential(scale=3, size=1000),
+    "Negatively Skewed": lambda rng: -rng.exponential(scale=1.5, size=1000),
+    "Unimodal Distribution": lambda rng: rng.normal(loc=0, scale=2.5, size=1000),
+    "Bimodal Distribution": lambda rng: _normal_mixture(rng, (-2, 2), (500, 500), 0.5),
+    "Multimodal Distribution": lambda rng: _normal_mixture(rng, (-2, 2, 5), (300, 300, 400), 0.5),
+}
+
+@lru_cache(maxsize=None)
+def _hist_data(kind):
+    """Generate the sample data for a distribution type (cached per type)"""
+    data = _HIST_GEN.get(kind, _HIST_GEN["Normal Distribution"])(key_rng("histogram", kind))
+    data.flags.writeable = False
+    return data
+
+def _gaussian_kde(data, grid):
+    """Evaluate a Gaussian KDE with Scott's bandwidth on a grid, fully vectorized"""
+    bandwidth = data.std(ddof=1) * data.size ** -0.2
+    z = (grid[:, None] - data[None, :]) / bandwidth
+    return np.exp(-0.5 * z * z).sum(axis=1) / (data.size * bandwidth * np.sqrt(2 * np.pi))
+
+# Largest sample whose KDE is evaluated point by point; bigger ones are first
+# binned onto _KDE_BINS equal-width bins and evaluated from the bin centres
+_KDE_EXACT_MAX = 5000
+_KDE_BINS = 4096
+
+def _binned_gaussian_kde(data, grid):
+    """Evaluate the same KDE as _gaussian_kde from a fine equal-width binning of the data"""
+    counts, edges = np.histogram(data, bins=_KDE_BINS)
+    centres = (edges[:-1] + edges[1:]) / 2
+    occupied = counts > 0
+    bandwidth = data.std(ddof=1) * data.size ** -0.2
+    z = (grid[:, None] - centres[None, occupied]) / bandwidth
+    return (np.exp(-0.5 * z * z) @ counts[occupied]) / (data.size * bandwidth * np.sqrt(2 * np.pi))
+
+def _histogram_layers(data, bins):
+    """Bin the data and evaluate its count-scaled KDE curve, like sns.histplot(kde=True)"""
+    # Equal-width bins given as a count and range take NumPy's direct index
+    # computation and bincount, rather than a binary search per value
+    edges = np.histogram_bin_edges(data, bins)
+    counts, edges = np.histogram(data, bins=edges.size - 1, range=(edges[0], edges[-1]))
+    # Like seaborn, no curve for a sample without spread
+    if data.size < 2 or np.isclose(data.var(), 0):
+        return counts, edges, None, None
+    grid = np.linspace(data.min(), data.max(), 200)
+    kde = _gaussian_kde if data.size <= _KDE_EXACT_MAX else _binned_gaussian_kde
+    curve = kde(data, grid) * data.size * (edges[1] - edges[0])
+    return counts, edges, grid, curve
+
+@lru_cache(maxsize=None)
+def _hist_layers(kind):
+    """Bin the data and evaluate its count-scaled KDE curve (cached per type)"""
+    return _histogram_layers(_hist_data(kind), 20)
+
+def _draw_histogram(ax, counts, edges, grid, curve, color):
+    """Draw binned counts and their KDE curve"""
+    # Same look as sns.histplot(kde=True); the KDE label marks the line as smooth for MAIDR
+    ax.hist(edges[:-1], bins=edges, weights=counts, facecolor=mcolors.to_rgba(color, 0.5),
+            edgecolor="white", linewidth=1)
+    if curve is not None:
+        ax.plot(grid, curve, color=color, linewidth=1.5, label="KDE")
 
 def create_histogram(input_distribution_type, input_hist_color, theme):
     """Create a histogram based on input parameters"""
     distribution_type = input_distribution_type
     color = color_palettes[input_hist_color]
 
-    # Generate data based on the selected distribution
-    if distribution_type == "Normal Distribution":
-        data = np.random.normal(size=1000)
-    elif distribution_type == "Positively Skewed":
-        data = np.random.exponential(scale=3, size=1000)
-    elif distribution_type == "Negatively Skewed":
-        data = -np.random.exponential(scale=1.5, size=1000)
-    elif distribution_type == "Unimodal Distribution":
-        data = np.random.normal(loc=0, scale=2.5, size=1000)
-    elif distribution_type == "Bimodal Distribution":
-        data = np.concatenate(
-            [
-                np.random.normal(-2, 0.5, size=500),
-                np.random.normal(2, 0.5, size=500),
-            ]
-        )
-    elif distribution_type == "Multimodal Distribution":
-        data = np.concatenate(
-            [
-                np.random.normal(-2, 0.5, size=300),
-                np.random.normal(2, 0.5, size=300),
-                np.random.normal(5, 0.5, size=400),
-            ]
-        )
-    else:
-        data = np.random.normal(size=1000)
+    counts, edges, grid, curve = _hist_layers(distribution_type)
 
     # Create the plot using matplotlib
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
-    sns.histplot(data, kde=True, bins=20, color=color, edgecolor="white", ax=ax)
+    fig, ax = get_plot_axes(theme=theme)
+    _draw_histogram(ax, counts, edges, grid, curve, color)
     ax.set_title(f"{distribution_type}")
     ax.set_xlabel("Value")
     ax.set_ylabel("Frequency")
@@ -50,11 +98,14 @@ def create_custom_histogram(df, var, color, theme):
     if not var or df is None:
         return None
         
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
-    sns.histplot(data=df, x=var, kde=True, color=color, ax=ax)
+    # Same bins ("auto") and KDE as sns.histplot(kde=True), computed directly
+    data = df[var].dropna().to_numpy(dtype=np.float64)
+    counts, edges, grid, curve = _histogram_layers(data, "auto")
+
+    fig, ax = get_plot_axes(theme=theme)
+    _draw_histogram(ax, counts, edges, grid, curve, color)
     ax.set_title(f"{var}")
-    ax.set_xlabel(var.replace("_", " ").title())
+    ax.set_xlabel(axis_label(var))
     ax.set_ylabel("Count")
     
     return ax
\ No newline at end of file
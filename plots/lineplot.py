@@ -1,27 +1,35 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from plots.utils import set_plot_theme, color_palettes
+from functools import lru_cache
+from plots.utils import get_plot_axes, color_palettes, key_rng, label_axes
+
+_LINE_X = np.linspace(0, 10, 20)  # Reduced number of points
+_LINE_X.flags.writeable = False
+
+# Y values generator for each line plot type
+_LINE_GEN = {
+    "Linear Trend": lambda x, rng: 2 * x + 1 + rng.normal(0, 1, 20),
+    "Exponential Growth": lambda x, rng: np.exp(0.5 * x) + rng.normal(0, 1, 20),
+    "Sinusoidal Pattern": lambda x, rng: 5 * np.sin(x) + rng.normal(0, 0.5, 20),
+    "Random Walk": lambda x, rng: np.cumsum(rng.normal(0, 1, 20)),
+}
+
+@lru_cache(maxsize=None)
+def _line_data(kind):
+    """Generate the y values for a line plot type (cached per type)"""
+    y = _LINE_GEN.get(kind, lambda x, rng: x + rng.normal(0, 1, 20))(_LINE_X, key_rng("lineplot", kind))
+    y.flags.writeable = False
+    return y
 
 def create_lineplot(input_lineplot_type, input_lineplot_color, theme):
     """Create a line plot based on input parameters"""
     lineplot_type = input_lineplot_type
     color = color_palettes[input_lineplot_color]
 
-    x = np.linspace(0, 10, 20)  # Reduced number of points
-    if lineplot_type == "Linear Trend":
-        y = 2 * x + 1 + np.random.normal(0, 1, 20)
-    elif lineplot_type == "Exponential Growth":
-        y = np.exp(0.5 * x) + np.random.normal(0, 1, 20)
-    elif lineplot_type == "Sinusoidal Pattern":
-        y = 5 * np.sin(x) + np.random.normal(0, 0.5, 20)
-    elif lineplot_type == "Random Walk":
-        y = np.cumsum(np.random.normal(0, 1, 20))
-    else:
-        y = x + np.random.normal(0, 1, 20)
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    x = _LINE_X
+    y = _line_data(lineplot_type)
+
+    fig, ax = get_plot_axes(theme=theme)
     sns.lineplot(x=x, y=y, ax=ax, color=color)
     ax.set_title(f"{lineplot_type}")
     ax.set_xlabel("X")
@@ -34,11 +42,11 @@ def create_custom_lineplot(df, var_x, var_y, color, theme):
     if not var_x or not var_y or df is None:
         return None
         
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
-    sns.lineplot(data=df, x=var_x, y=var_y, color=color, ax=ax)
+    fig, ax = get_plot_axes(theme=theme)
+    # One stable sort up front instead of seaborn sorting again while it aggregates
+    data = df.sort_values(var_x, kind="stable")
+    sns.lineplot(data=data, x=var_x, y=var_y, color=color, ax=ax, sort=False)
     ax.set_title(f"{var_y} vs {var_x}")
-    ax.set_xlabel(var_x.replace("_", " ").title())
-    ax.set_ylabel(var_y.replace("_", " ").title())
+    label_axes(ax, var_x, var_y)
     
     return ax
\ No newline at end of file
@@ -2,15 +2,20 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from plots.utils import set_plot_theme, color_palettes
+from functools import lru_cache
+from plots.utils import get_plot_axes, color_palettes, make_rng, axis_label
 
+@lru_cache(maxsize=None)
 def generate_multilayer_data():
-    """Generate sample data for the multilayer plot"""
+    """Generate sample data for the multilayer plot (generated once, read-only)"""
+    rng = make_rng("multilayerplot")
     x = np.arange(8)
     bar_data = np.array([3, 5, 2, 7, 3, 6, 4, 5])
-    hist_data = np.concatenate([np.random.normal(loc=i, scale=0.5, size=20) for i in x])
+    hist_data = np.concatenate([rng.normal(loc=i, scale=0.5, size=20) for i in x])
     scatter_data = np.array([4, 6, 3, 8, 2, 7, 5, 6])
     line_data = np.array([10, 8, 12, 14, 9, 11, 13, 10])
+    for array in (x, bar_data, hist_data, scatter_data, line_data):
+        array.flags.writeable = False
     
     # Create a dictionary with the generated data
     return {
@@ -50,8 +55,7 @@ def create_multilayer_plot(input_background_type, background_color, line_color,
     line_data = data["line_data"]
     
     # Create a figure and a set of subplots
-    fig, ax1 = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax1, theme)
+    fig, ax1 = get_plot_axes(theme=theme)
     
     # Get colors from the color_palettes dictionary or use default if not found
     bg_color = color_palettes.get(background_color, "skyblue")
@@ -134,8 +138,7 @@ def create_custom_multilayer_plot(df, var_x, var_background, var_line, backgroun
         return None
     
     # Create a figure and a set of subplots
-    fig, ax1 = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax1, theme)
+    fig, ax1 = get_plot_axes(theme=theme)
     
     # Get data from dataframe
     x = df[var_x].values
@@ -157,7 +160,7 @@ def create_custom_multilayer_plot(df, var_x, var_background, var_line, backgroun
         else:
             ax1.bar(x, background_data, color=bg_color, label=var_background, alpha=0.7)
         
-        ax1.set_ylabel(var_background.replace("_", " ").title(), color=bg_color)
+        ax1.set_ylabel(axis_label(var_background), color=bg_color)
         y_min, y_max = 0, max(background_data) * 1.2
     
     elif background_type == "Histogram":
@@ -177,11 +180,11 @@ def create_custom_multilayer_plot(df, var_x, var_background, var_line, backgroun
         else:
             ax1.scatter(x, background_data, color=bg_color, label=var_background, alpha=0.7, s=100)
             
-        ax1.set_ylabel(var_background.replace("_", " ").title(), color=bg_color)
+        ax1.set_ylabel(axis_label(var_background), color=bg_color)
         y_min, y_max = min(background_data) * 0.8, max(background_data) * 1.2
     
     ax1.tick_params(axis="y", labelcolor=bg_color)
-    ax1.set_xlabel(var_x.replace("_", " ").title())
+    ax1.set_xlabel(axis_label(var_x))
     
     # Set y-axis limits for the background plot
     ax1.set_ylim(y_min, y_max)
@@ -197,7 +200,7 @@ def create_custom_multilayer_plot(df, var_x, var_background, var_line, backgroun
     else:
         ax2.plot(x, line_data, color=ln_color, marker="o", linestyle="-", linewidth=2, label=var_line)
         
-    ax2.set_ylabel(var_line.replace("_", " ").title(), color=ln_color)
+    ax2.set_ylabel(axis_label(var_line), color=ln_color)
     ax2.tick_params(axis="y", labelcolor=ln_color)
     
     # Add title
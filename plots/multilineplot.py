@@ -1,75 +1,77 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 import pandas as pd
-from plots.utils import set_plot_theme
+from functools import lru_cache
+from types import MappingProxyType
+from plots.utils import get_plot_axes, key_rng, label_axes
 
+# Map friendly palette names to seaborn palette names (read-only, shared)
+PALETTE_MAPPING = MappingProxyType({
+    "Default": None,  # Use default seaborn palette
+    "Colorful": "Set1",
+    "Pastel": "Set2",
+    "Dark Tones": "Dark2",
+    "Paired Colors": "Paired",
+    "Rainbow": "Spectral"
+})
+
+# The x values and series labels are the same for every multiline type
+_MULTI_POINTS = 30  # 30 points for x-axis
+_MULTI_X = np.linspace(0, 10, _MULTI_POINTS)
+_MULTI_X_TILED = np.tile(_MULTI_X, 3)
+_MULTI_SERIES = np.repeat(np.array(["Series 1", "Series 2", "Series 3"], dtype=object), _MULTI_POINTS)
+for _array in (_MULTI_X, _MULTI_X_TILED, _MULTI_SERIES):
+    _array.flags.writeable = False
+
+@lru_cache(maxsize=8)
 def generate_multiline_data(multiline_type):
-    """Generate data for multiline plots based on the selected type"""
-    x = np.linspace(0, 10, 30)  # 30 points for x-axis
-    series_names = ["Series 1", "Series 2", "Series 3"]
+    """Generate data for multiline plots based on the selected type (cached per type)"""
+    rng = key_rng("multilineplot", multiline_type)
+    x = _MULTI_X
+    n = _MULTI_POINTS
+    # Each series is written straight into its slice of one y column
+    y = np.empty(3 * n)
+    y1, y2, y3 = y[:n], y[n:2 * n], y[2 * n:]
     
     if multiline_type == "Simple Trends":
         # Linear trends with different slopes
-        y1 = 1.5 * x + np.random.normal(0, 1, 30)
-        y2 = 0.5 * x + 5 + np.random.normal(0, 1, 30)
-        y3 = -x + 15 + np.random.normal(0, 1, 30)
+        y1[:] = 1.5 * x + rng.normal(0, 1, n)
+        y2[:] = 0.5 * x + 5 + rng.normal(0, 1, n)
+        y3[:] = -x + 15 + rng.normal(0, 1, n)
     elif multiline_type == "Seasonal Patterns":
         # Sinusoidal patterns with different phases
-        y1 = 5 * np.sin(x) + 10 + np.random.normal(0, 0.5, 30)
-        y2 = 5 * np.sin(x + np.pi/2) + 10 + np.random.normal(0, 0.5, 30)
-        y3 = 5 * np.sin(x + np.pi) + 10 + np.random.normal(0, 0.5, 30)
+        y1[:] = 5 * np.sin(x) + 10 + rng.normal(0, 0.5, n)
+        y2[:] = 5 * np.sin(x + np.pi/2) + 10 + rng.normal(0, 0.5, n)
+        y3[:] = 5 * np.sin(x + np.pi) + 10 + rng.normal(0, 0.5, n)
     elif multiline_type == "Growth Comparison":
         # Different growth patterns
-        y1 = np.exp(0.2 * x) + np.random.normal(0, 0.5, 30)
-        y2 = x**2 / 10 + np.random.normal(0, 1, 30)
-        y3 = np.log(x + 1) * 5 + np.random.normal(0, 0.5, 30)
+        y1[:] = np.exp(0.2 * x) + rng.normal(0, 0.5, n)
+        y2[:] = x**2 / 10 + rng.normal(0, 1, n)
+        y3[:] = np.log(x + 1) * 5 + rng.normal(0, 0.5, n)
     else:  # Random Series
         # Random walks with different volatilities
-        y1 = np.cumsum(np.random.normal(0, 0.5, 30))
-        y2 = np.cumsum(np.random.normal(0.1, 0.7, 30))
-        y3 = np.cumsum(np.random.normal(-0.05, 0.9, 30))
+        np.cumsum(rng.normal(0, 0.5, n), out=y1)
+        np.cumsum(rng.normal(0.1, 0.7, n), out=y2)
+        np.cumsum(rng.normal(-0.05, 0.9, n), out=y3)
     
-    # Create a dataframe with the generated data
-    return pd.DataFrame({
-        "x": np.tile(x, 3),
-        "y": np.concatenate([y1, y2, y3]),
-        "series": np.repeat(series_names, len(x))
-    })
+    # Create a dataframe around the generated data without copying it
+    return pd.DataFrame({"x": _MULTI_X_TILED, "y": y, "series": _MULTI_SERIES}, copy=False)
 
 def create_multiline_plot(data, input_multiline_type, input_multiline_color, theme):
     """Create a multiline plot based on input parameters and data"""
     multiline_type = input_multiline_type
     palette = input_multiline_color
     
-    # Map friendly palette names to seaborn palette names
-    palette_mapping = {
-        "Default": None,  # Use default seaborn palette
-        "Colorful": "Set1",
-        "Pastel": "Set2",
-        "Dark Tones": "Dark2",
-        "Paired Colors": "Paired",
-        "Rainbow": "Spectral"
-    }
-    
     # Create the plot
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     
-    # Use seaborn lineplot for multiple lines
-    if palette == "Default":
-        # Use default seaborn color palette
-        sns.lineplot(
-            x="x", y="y", hue="series", style="series", 
-            markers=True, dashes=True, data=data, ax=ax
-        )
-    else:
-        # Use selected color palette
-        sns.lineplot(
-            x="x", y="y", hue="series", style="series", 
-            markers=True, dashes=True, data=data, ax=ax,
-            palette=palette_mapping[palette]
-        )
+    # Use seaborn lineplot for multiple lines; "Default" maps to None, which
+    # is seaborn's default color palette
+    sns.lineplot(
+        x="x", y="y", hue="series", style="series", 
+        markers=True, dashes=True, data=data, ax=ax,
+        palette=PALETTE_MAPPING[palette]
+    )
     
     # Customize the plot
     ax.set_title(f"Multiline Plot: {multiline_type}")
@@ -83,38 +85,18 @@ def create_custom_multiline_plot(df, var_x, var_y, var_group, palette, theme):
     if not var_x or not var_y or not var_group or df is None:
         return None
     
-    # Map friendly palette names to seaborn palette names
-    palette_mapping = {
-        "Default": None,  # Use default seaborn palette
-        "Colorful": "Set1",
-        "Pastel": "Set2",
-        "Dark Tones": "Dark2",
-        "Paired Colors": "Paired",
-        "Rainbow": "Spectral"
-    }
-    
     # Create the plot
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     
-    # Use seaborn lineplot for multiple lines
-    if palette == "Default":
-        # Use default seaborn color palette
-        sns.lineplot(
-            x=var_x, y=var_y, hue=var_group, style=var_group, 
-            markers=True, dashes=True, data=df, ax=ax
-        )
-    else:
-        # Use selected color palette
-        sns.lineplot(
-            x=var_x, y=var_y, hue=var_group, style=var_group, 
-            markers=True, dashes=True, data=df, ax=ax,
-            palette=palette_mapping[palette]
-        )
+    # Use seaborn lineplot for multiple lines ("Default" maps to None)
+    sns.lineplot(
+        x=var_x, y=var_y, hue=var_group, style=var_group, 
+        markers=True, dashes=True, data=df, ax=ax,
+        palette=PALETTE_MAPPING[palette]
+    )
     
     # Customize the plot
     ax.set_title(f"{var_y} vs {var_x} by {var_group}")
-    ax.set_xlabel(var_x.replace("_", " ").title())
-    ax.set_ylabel(var_y.replace("_", " ").title())
+    label_axes(ax, var_x, var_y)
     
     return ax
\ No newline at end of file
@@ -1,26 +1,30 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from plots.utils import set_plot_theme
+from functools import lru_cache
+from plots.utils import set_plot_theme, use_theme_style, new_figure, make_rng, label_axes
 
+@lru_cache(maxsize=None)
 def generate_multipanel_data():
-    """Generate sample data for the multipanel plot"""
+    """Generate sample data for the multipanel plot (generated once, read-only)"""
+    rng = make_rng("multipanelplot")
     # Data for line plot
     x_line = np.array([1, 2, 3, 4, 5, 6, 7, 8])
     y_line = np.array([2, 4, 1, 5, 3, 7, 6, 8])
     
     # Data for first bar plot
     categories = ["A", "B", "C", "D", "E"]
-    values = np.random.rand(5) * 10
+    values = rng.random(5) * 10
     
     # Data for second bar plot
     categories_2 = ["A", "B", "C", "D", "E"]
-    values_2 = np.random.randn(5) * 100
+    values_2 = rng.standard_normal(5) * 100
     
     # Data for scatter plot
-    x_scatter = np.random.randn(50)
-    y_scatter = np.random.randn(50)
+    x_scatter = rng.standard_normal(50)
+    y_scatter = rng.standard_normal(50)
+    for array in (x_line, y_line, values, values_2, x_scatter, y_scatter):
+        array.flags.writeable = False
     
     # Create a dictionary with the generated data
     return {
@@ -64,10 +68,9 @@ def create_multipanel_plot(layout_type, color_palette, theme):
     y_scatter = data["y_scatter"]
     
     # Create a figure with 3 subplots arranged vertically
-    fig, axs = plt.subplots(3, 1, figsize=(10, 12))
-    
-    # Make sure this figure is the current figure
-    plt.figure(fig.number)
+    use_theme_style(theme)
+    fig = new_figure(figsize=(10, 12))
+    axs = fig.subplots(3, 1)
     
     # First panel: Line plot
     axs[0].plot(x_line, y_line, color="blue", linewidth=2)
@@ -93,7 +96,7 @@ def create_multipanel_plot(layout_type, color_palette, theme):
         set_plot_theme(fig, ax, theme)
     
     # Adjust layout to prevent overlap
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Return the first axes object for maidr compatibility
     return axs[0]
@@ -153,10 +156,9 @@ def create_custom_multipanel_plot(df, vars_config, layout_type, color_palette, t
         return None
     
     # Create the figure with 3 subplots arranged vertically
-    fig, axs = plt.subplots(3, 1, figsize=(10, 12))
-    
-    # Make sure this figure is the current figure
-    plt.figure(fig.number)
+    use_theme_style(theme)
+    fig = new_figure(figsize=(10, 12))
+    axs = fig.subplots(3, 1)
     
     # First panel
     if plot1_type == 'line':
@@ -175,8 +177,7 @@ def create_custom_multipanel_plot(df, vars_config, layout_type, color_palette, t
             axs[0].bar(df[plot1_x], df[plot1_y], color="blue", alpha=0.7)
         axs[0].set_title(f"Bar Plot: {plot1_y} by {plot1_x}")
     
-    axs[0].set_xlabel(plot1_x.replace("_", " ").title())
-    axs[0].set_ylabel(plot1_y.replace("_", " ").title())
+    label_axes(axs[0], plot1_x, plot1_y)
     
     # Second panel
     if plot2_type == 'line':
@@ -195,8 +196,7 @@ def create_custom_multipanel_plot(df, vars_config, layout_type, color_palette, t
             axs[1].bar(df[plot2_x], df[plot2_y], color="green", alpha=0.7)
         axs[1].set_title(f"Bar Plot: {plot2_y} by {plot2_x}")
     
-    axs[1].set_xlabel(plot2_x.replace("_", " ").title())
-    axs[1].set_ylabel(plot2_y.replace("_", " ").title())
+    label_axes(axs[1], plot2_x, plot2_y)
     
     # Third panel
     if plot3_type == 'line':
@@ -215,15 +215,14 @@ def create_custom_multipanel_plot(df, vars_config, layout_type, color_palette, t
             axs[2].bar(df[plot3_x], df[plot3_y], color="blue", alpha=0.7)
         axs[2].set_title(f"Bar Plot: {plot3_y} by {plot3_x}")
     
-    axs[2].set_xlabel(plot3_x.replace("_", " ").title())
-    axs[2].set_ylabel(plot3_y.replace("_", " ").title())
+    label_axes(axs[2], plot3_x, plot3_y)
     
     # Apply theme to all subplots
     for ax in axs.flat:
         set_plot_theme(fig, ax, theme)
     
     # Adjust layout to prevent overlap
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Return the first axes object for maidr compatibility
     return axs[0]
\ No newline at end of file
@@ -1,36 +1,41 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from plots.utils import set_plot_theme, color_palettes
+from functools import lru_cache
+from plots.utils import get_plot_axes, key_rng, color_palettes, label_axes
+
+# (slope, noise scale) of y = slope * x + noise for each correlation type
+_SCATTER_PARAMS = {
+    "No Correlation": (0.0, 1.0),
+    "Weak Positive Correlation": (0.3, 1.0),
+    "Strong Positive Correlation": (0.9, 0.1),
+    "Weak Negative Correlation": (-0.3, 1.0),
+    "Strong Negative Correlation": (-0.9, 0.1),
+}
+
+@lru_cache(maxsize=None)
+def _scatter_data(kind):
+    """Generate the (x, y) sample data for a correlation type (cached per type)"""
+    slope, noise_scale = _SCATTER_PARAMS.get(kind, _SCATTER_PARAMS["No Correlation"])
+    rng = key_rng("scatterplot", kind)
+    num_points = int(rng.integers(20, 31))  # Randomly select between 20 and 30 points
+    # One draw fills both coordinates; y is then scaled and shifted in place
+    x, y = rng.random((2, num_points))
+    y *= noise_scale
+    y += slope * x
+
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
 
 def create_scatterplot(input_scatterplot_type, input_scatter_color, theme):
     """Create a scatter plot with regression layers based on input parameters"""
     scatterplot_type = input_scatterplot_type
     color = color_palettes[input_scatter_color]
 
-    num_points = np.random.randint(20, 31)  # Randomly select between 20 and 30 points
-    if scatterplot_type == "No Correlation":
-        x = np.random.uniform(size=num_points)
-        y = np.random.uniform(size=num_points)
-    elif scatterplot_type == "Weak Positive Correlation":
-        x = np.random.uniform(size=num_points)
-        y = 0.3 * x + np.random.uniform(size=num_points)
-    elif scatterplot_type == "Strong Positive Correlation":
-        x = np.random.uniform(size=num_points)
-        y = 0.9 * x + np.random.uniform(size=num_points) * 0.1
-    elif scatterplot_type == "Weak Negative Correlation":
-        x = np.random.uniform(size=num_points)
-        y = -0.3 * x + np.random.uniform(size=num_points)
-    elif scatterplot_type == "Strong Negative Correlation":
-        x = np.random.uniform(size=num_points)
-        y = -0.9 * x + np.random.uniform(size=num_points) * 0.1
-    else:
-        x = np.random.uniform(size=num_points)
-        y = np.random.uniform(size=num_points)
+    x, y = _scatter_data(scatterplot_type)
 
     # Create the plot using matplotlib
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     
     # Ensure clean white background (remove any pink tinting)
     if theme != "Dark":
@@ -62,8 +67,7 @@ def create_custom_scatterplot(df, var_x, var_y, color, theme):
     if not var_x or not var_y or df is None:
         return None
         
-    fig, ax = plt.subplots(figsize=(10, 6))
-    set_plot_theme(fig, ax, theme)
+    fig, ax = get_plot_axes(theme=theme)
     
     # Ensure clean white background (remove any pink tinting)
     if theme != "Dark":
@@ -85,8 +89,7 @@ def create_custom_scatterplot(df, var_x, var_y, color, theme):
                 ci=None)  # Remove confidence interval to avoid pink shading
     
     ax.set_title(f"{var_y} vs {var_x}")
-    ax.set_xlabel(var_x.replace("_", " ").title())
-    ax.set_ylabel(var_y.replace("_", " ").title())
+    label_axes(ax, var_x, var_y)
     ax.legend()
     
     return ax
\ No newline at end of file
@@ -1,25 +1,182 @@
+import asyncio
+import functools
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 import pandas as pd
-import seaborn as sns
+
+# Plot drawing runs on a single worker thread so the event loop stays free.
+# set_plot_theme switches pyplot's global style, so every builder call (tutorial
+# and Practice alike) must go through run_plot_task for draws not to overlap;
+# the single worker is what serializes them. Pyodide (Shinylive) has no
+# threads, so draw inline.
+_draw_pool = None if sys.platform == "emscripten" else ThreadPoolExecutor(max_workers=1)
+
+async def run_plot_task(fn, *args, **kwargs):
+    """Run a plot function on the drawing thread and return its result"""
+    if _draw_pool is None:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_draw_pool, functools.partial(fn, *args, **kwargs))
+
+# Rendering settings layered on top of every theme style
+RC_OVERRIDES = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,
+    # Keep SVG text as <text> elements instead of embedding every glyph as a path
+    "svg.fonttype": "none",
+    # Figures are reused or closed by the renderer, so pyplot's warning is noise
+    "figure.max_open_warning": 0,
+}
+plt.rcParams.update(RC_OVERRIDES)
+
+def _style_params(style):
+    """Return the rcParams a style gives on top of Matplotlib's defaults"""
+    with plt.style.context(style, after_reset=True):
+        return dict(plt.rcParams)
+
+def _theme_params():
+    """Return, per style, the rcParams that differ between the two theme styles,
+    with RC_OVERRIDES layered on top"""
+    light, dark = _style_params("default"), _style_params("dark_background")
+    changed = [key for key in light if light[key] != dark[key]]
+    return {
+        style: MappingProxyType({**{key: params[key] for key in changed}, **RC_OVERRIDES})
+        for style, params in (("default", light), ("dark_background", dark))
+    }
+
+# Switching theme is a single rcParams.update with these, so renders running on
+# other threads never see the settings pass through Matplotlib's defaults
+_THEME_PARAMS = _theme_params()
+
+# Seed shared by all generated sample data
+SEED = 1000
+
+# Stream index of each plot module's generator
+RNG_STREAMS = {
+    "histogram": 0,
+    "boxplot": 1,
+    "scatterplot": 2,
+    "barplot": 3,
+    "lineplot": 4,
+    "heatmap": 5,
+    "multilineplot": 6,
+    "multilayerplot": 7,
+    "multipanelplot": 8,
+}
+
+def make_rng(stream):
+    """Return a reproducible Philox generator on its own jumped stream"""
+    return np.random.Generator(np.random.Philox(SEED).jumped(RNG_STREAMS[stream]))
+
+def key_rng(stream, key):
+    """Return a reproducible generator for one input value of a plot module, so
+    sample data does not depend on the order the values are first requested"""
+    seed = np.random.SeedSequence((SEED, RNG_STREAMS[stream], zlib.crc32(key.encode())))
+    return np.random.Generator(np.random.Philox(seed))
+
+# The matplotlib style currently applied to rcParams
+_current_style = None
+
+def use_theme_style(theme):
+    """Switch pyplot's global style to the theme's. Axes take their text, tick and
+    spine colors from the style when they are created, so call this first."""
+    global _current_style
+    style = "dark_background" if theme == "Dark" else "default"
+    if style != _current_style:
+        plt.rcParams.update(_THEME_PARAMS[style])
+        _current_style = style
 
 def set_plot_theme(fig, ax, theme):
     """Apply the appropriate theme to a plot"""
+    use_theme_style(theme)
     if theme == "Dark":
-        plt.style.use("dark_background")
         fig.patch.set_facecolor("#2E2E2E")
         ax.set_facecolor("#2E2E2E")
     else:
-        plt.style.use("default")
         fig.patch.set_facecolor("white")
         ax.set_facecolor("white")
-        
-# Dictionary of color palettes
-color_palettes = {
+
+def get_plot_axes(figsize=(10, 6), theme=None):
+    """Return a fresh figure and axes, with the theme applied when one is given"""
+    # Switch the style before the axes exist, so they are created in its colors
+    if theme is not None:
+        use_theme_style(theme)
+    fig, ax = new_axes(figsize)
+    if theme is not None:
+        set_plot_theme(fig, ax, theme)
+    return fig, ax
+
+def new_figure(figsize=(10, 6)):
+    """Return an empty figure built outside pyplot, so the renderer's cleanup
+    never closes it"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def new_axes(figsize=(10, 6)):
+    """Return a figure built outside pyplot together with its single axes"""
+    fig = new_figure(figsize)
+    return fig, fig.add_subplot()
+
+class FigureCache:
+    """LRU cache of finished figures shared by every session, keyed by plot inputs
+
+    The cached figures are shared mutable objects: savefig swaps a figure's dpi
+    and canvas while it writes, so any code that saves one outside render_maidr
+    must hold maidr.util.figure_lock.figure_lock(fig), as maidr does itself.
+    """
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._axes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached axes for key, or None"""
+        with self._lock:
+            ax = self._axes.get(key)
+            if ax is not None:
+                self._axes.move_to_end(key)
+            return ax
+
+    def draw(self, key, builder, *args):
+        """Return the cached axes for key, drawing it with builder on a miss"""
+        ax = self.get(key)
+        if ax is None:
+            # The builder creates its own figure, after switching to its theme's style
+            ax = builder(*args)
+            if ax is None:
+                return None
+            with self._lock:
+                self._axes[key] = ax
+                if len(self._axes) > self.max_size:
+                    self._axes.popitem(last=False)
+        return ax
+
+@functools.lru_cache(maxsize=256)
+def axis_label(name):
+    """Turn a column name into an axis label (e.g. unit_price -> Unit Price)"""
+    return name.replace("_", " ").title()
+
+def label_axes(ax, var_x, var_y):
+    """Label both axes of a plot of var_y against var_x"""
+    ax.set(xlabel=axis_label(var_x), ylabel=axis_label(var_y))
+
+# Dictionary of color palettes (read-only, shared across sessions)
+color_palettes = MappingProxyType({
     "Default": "#007bc2",
     "Red": "#FF0000",
     "Green": "#00FF00",
     "Blue": "#0000FF",
     "Purple": "#800080",
     "Orange": "#FFA500",
-}
\ No newline at end of file
+})
\ No newline at end of file